@@ -14,40 +14,163 @@ Intranet panel to:
 This MVP uses a minimal HTML UI (Jinja2 templates).
 """
 
-from fastapi import FastAPI, Request, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse
+from fastapi import FastAPI, Request, UploadFile, File, Form, BackgroundTasks
+from fastapi.responses import Response, HTMLResponse, RedirectResponse, FileResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
+from fastapi.concurrency import run_in_threadpool
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 from pathlib import Path
 import re
 import sys
+import asyncio
 import json
+import errno
+import hashlib
+import io
 import time
 import importlib.metadata
-import urllib.request
+import http.client
 import shutil
 import subprocess
+import tempfile
 import uuid
 import zipfile
+import zlib
 import os
+import mmap
+import multiprocessing
 import threading
+from collections import deque
+from collections.abc import Callable
+from contextlib import asynccontextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone
+from functools import lru_cache
+from packaging.utils import InvalidWheelFilename, parse_wheel_filename
+from packaging.version import InvalidVersion, Version
+
+try:
+    # optional: faster JSON parse/dump; stdlib json otherwise
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # optional (python3-systemd): read service logs without forking journalctl
+    from systemd import journal
+except ImportError:
+    journal = None
 
 BASE = Path("/opt/release_manager")
 RELEASES = BASE / "releases"
 CURRENT = BASE / "current"
-UPLOADS = BASE / "runtime" / "uploads"
+RUNTIME = BASE / "runtime"
+UPLOADS = RUNTIME / "uploads"
 VENV = BASE / "venv" / "bin" / "python"
+# golden per-release venv (pip/setuptools/wheel upgraded), cloned into releases
+VENV_TEMPLATE = BASE / "venv_template"
+# shared across releases: pip's http/wheel cache and a wheelhouse of installed pins
+PIP_CACHE_DIR = RUNTIME / "pip-cache"
+WHEELHOUSE = RUNTIME / "wheelhouse"
+# WHEELHOUSE size cap; the oldest wheels are removed first once it is exceeded
+WHEELHOUSE_MAX_BYTES = int(os.environ.get("RELEASE_MANAGER_WHEELHOUSE_MAX_MB", "2048")) * 1024 * 1024
 SERVICE_NAME = "ml-release-service"
 SERVICE_PORT = 8000
 DEFAULT_HEALTH_PATH = "/health"
 HEALTH_TIMEOUT_SEC = 8
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# buffer for file copies (extraction, bundle members) and the bundle writer
+IO_BUFFER_SIZE = 1 << 18
+
+# never bundled: per-host venv/bytecode, the bundle itself and install progress
+BUNDLE_EXCLUDED_DIRS = {".venv", "__pycache__"}
+BUNDLE_EXCLUDED_FILES = {"release_bundle.zip", "release_bundle.zip.sha", ".deps_install_progress.json"}
+# in-progress rebuilds of release_bundle.zip (see build_canonical_zip)
+BUNDLE_PART_PREFIX = ".release_bundle.zip."
+
+# release_bundle.zip compression: "stored" (default, payloads are mostly
+# already compressed), "deflated", "bzip2" or "lzma"
+BUNDLE_COMPRESSION_TYPES = {
+    "stored": zipfile.ZIP_STORED,
+    "deflated": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+BUNDLE_COMPRESSION = os.environ.get("RELEASE_MANAGER_BUNDLE_COMPRESSION", "stored").lower()
+# deflate level (1 = fastest); bzip2 takes 1-9, lzma ignores it
+BUNDLE_COMPRESSLEVEL = int(os.environ.get("RELEASE_MANAGER_BUNDLE_COMPRESSLEVEL", "1"))
+# members up to this size are deflated in parallel (held in memory while in flight)
+PARALLEL_DEFLATE_MAX_BYTES = 64 * 1024 * 1024
+DEFLATE_WORKERS = os.cpu_count() or 1
+# already-compressed payloads are always stored, whatever BUNDLE_COMPRESSION says
+INCOMPRESSIBLE_SUFFIXES = {
+    ".whl", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".7z",
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".mp4", ".mp3",
+    ".pt", ".pth", ".onnx", ".safetensors",
+}
+
+# opt-in: download missing wheels with this many parallel pip processes before
+# the (single) install; 0 keeps the plain pip install path
+PIP_PARALLEL_DOWNLOADS = int(os.environ.get("RELEASE_MANAGER_PIP_PARALLEL_DOWNLOADS", "0"))
 
 RUNTIME_BASE_DEPS = {
     "fastapi": ["fastapi", "uvicorn"],
 }
 
-app = FastAPI(title="Release Manager - Admin")
-templates = Jinja2Templates(directory=str(Path(__file__).resolve().parent.parent / "templates"))
+# nginx "internal" location aliased to RELEASES (X-Accel-Redirect downloads)
+NGINX_INTERNAL_RELEASES = "/_internal_releases/"
+# hand fresh bundle downloads to nginx via X-Accel-Redirect; only enable when the
+# panel is reached exclusively through an nginx that defines the location above
+X_ACCEL_DOWNLOADS = os.environ.get("RELEASE_MANAGER_X_ACCEL", "0") == "1"
+
+# landing page; every redirect points here directly instead of chaining via /admin
+ADMIN_HOME = "/admin/install"
+
+def sweep_trash() -> None:
+    """
+    Remove .trash-* leftovers of deletes (see move_to_trash) whose background
+    rmtree never ran or stopped partway, e.g. because the process restarted.
+    """
+    for parent in (RELEASES, BASE):
+        try:
+            with os.scandir(parent) as it:
+                leftovers = [e.path for e in it if e.name.startswith(".trash-")]
+        except OSError:
+            continue
+        for path in leftovers:
+            shutil.rmtree(path, ignore_errors=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # sweep off the startup path: large trees must not delay serving
+    threading.Thread(target=sweep_trash, daemon=True).start()
+    yield
+
+app = FastAPI(title="Release Manager - Admin", lifespan=lifespan)
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+JINJA_CACHE = RUNTIME / "jinja_cache"
+
+def make_templates() -> Jinja2Templates:
+    """
+    Templates are only changed by a redeploy, so skip per-render mtime checks
+    and keep compiled bytecode on disk across restarts (when writable).
+    """
+    bytecode_cache = None
+    try:
+        JINJA_CACHE.mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(JINJA_CACHE))
+    except OSError:
+        pass
+    env = Environment(
+        loader=FileSystemLoader(str(TEMPLATES_DIR)),
+        autoescape=True,
+        auto_reload=False,
+        bytecode_cache=bytecode_cache,
+    )
+    return Jinja2Templates(env=env)
+
+templates = make_templates()
 
 def run(cmd: list[str], cwd: Path | None = None) -> tuple[int, str]:
     p = subprocess.run(
@@ -59,165 +182,728 @@ def run(cmd: list[str], cwd: Path | None = None) -> tuple[int, str]:
     )
     return p.returncode, p.stdout
 
+def run_streaming(cmd: list[str], on_line: Callable[[str], None], cwd: Path | None = None) -> tuple[int, str]:
+    """
+    Like run(), but hands each output line to on_line as it arrives.
+    """
+    lines = []
+    with subprocess.Popen(
+        cmd,
+        cwd=str(cwd) if cwd else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1
+    ) as p:
+        for line in p.stdout:
+            lines.append(line)
+            on_line(line)
+    return p.returncode, "".join(lines)
+
+
+# anything outside [A-Za-z0-9_-] is dropped from folder names
+_UNSAFE_NAME_RE = re.compile(r"[^A-Za-z0-9_-]+")
 
 def safe_name(name: str) -> str:
     # allow only safe folder names
-    allowed = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
-    return "".join([c for c in name if c in allowed]).strip("_-")
+    return _UNSAFE_NAME_RE.sub("", name).strip("_-")
+
+
+
+def json_loads(data: bytes | str):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def json_dumps_pretty(obj) -> bytes:
+    # indented UTF-8 bytes, ready for write_bytes()
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def mtime_ns(p) -> int | None:
+    # one stat syscall; None when missing
+    try:
+        return os.stat(p).st_mtime_ns
+    except OSError:
+        return None
+
+def code_version() -> str:
+    """
+    Stamp of the deployed panel code: newest mtime among this module and the
+    templates. Part of the page ETags, so an upgrade doesn't get 304s for old HTML.
+    """
+    paths = [__file__]
+    for root, _, files in os.walk(TEMPLATES_DIR):
+        paths += [os.path.join(root, f) for f in files]
+    return str(max(mtime_ns(p) or 0 for p in paths))
+
+CODE_VERSION = code_version()
+
+def stat_key(p) -> tuple[int, int] | None:
+    # (mtime_ns, size) from one stat; a same-tick rewrite usually changes the size
+    try:
+        st = os.stat(p)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+@lru_cache(maxsize=256)
+def parse_json_cached(path: str, key: tuple[int, int]) -> dict:
+    """
+    Parsed JSON file, keyed on (path, stat_key) so a rewrite is picked up on the
+    next stat. {} if unreadable. Shared between callers: don't mutate the result.
+    """
+    try:
+        return json_loads(Path(path).read_bytes())
+    except Exception:
+        return {}
+
+def active_release_name() -> str | None:
+    """
+    Name of the release CURRENT points at (always a releases/<name> symlink),
+    from a single readlink instead of resolving every path.
+    """
+    try:
+        return os.path.basename(os.readlink(CURRENT))
+    except OSError:
+        return None
+
+def is_active_release(rname: str) -> bool:
+    return active_release_name() == rname
 
 def list_releases():
     items = []
-    if RELEASES.exists():
-        for d in sorted(RELEASES.iterdir()):
-            if d.is_dir():
-                meta = d / "release.json"
-                status = "UNKNOWN"
-                if (d / "validation_report.json").exists():
-                    rep = json.loads((d / "validation_report.json").read_text())
-                    status = "VALID" if rep.get("ok") else "INVALID"
-                active = CURRENT.resolve() == d.resolve() if CURRENT.exists() else False
-                items.append({
-                    "name": d.name,
-                    "path": str(d),
-                    "status": "ACTIVE" if active else status,
-                    "has_bundle": (d / "release_bundle.zip").exists(),
-                    "meta": json.loads(meta.read_text()) if meta.exists() else {}
-                })
+    try:
+        with os.scandir(RELEASES) as it:
+            # skip .trash-* leftovers of deletes in progress
+            entries = sorted(
+                (e for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith(".")),
+                key=lambda e: e.name,
+            )
+    except FileNotFoundError:
+        return items
+
+    active_name = active_release_name()
+    for e in entries:
+        meta_path = os.path.join(e.path, "release.json")
+        report_path = os.path.join(e.path, "validation_report.json")
+        meta_key = stat_key(meta_path)
+        report_key = stat_key(report_path)
+
+        status = "UNKNOWN"
+        if report_key is not None:
+            rep = parse_json_cached(report_path, report_key)
+            status = "VALID" if rep.get("ok") else "INVALID"
+        meta = parse_json_cached(meta_path, meta_key) if meta_key is not None else {}
+
+        active = e.name == active_name
+        items.append({
+            "name": e.name,
+            "path": e.path,
+            "status": "ACTIVE" if active else status,
+            "has_bundle": mtime_ns(os.path.join(e.path, "release_bundle.zip")) is not None,
+            "meta": meta
+        })
     return items
 
-def validate_zip_structure(tmp_dir: Path) -> tuple[bool, list[str]]:
+def releases_etag() -> str:
+    """
+    Weak ETag for the release list pages, built from stats only: the panel code
+    version, the RELEASES directory, the CURRENT link and each release's
+    release.json/validation report.
+    """
+    h = hashlib.sha256(CODE_VERSION.encode("utf-8"))
+    h.update(f"{mtime_ns(RELEASES)}\0".encode("utf-8"))
+    try:
+        h.update(os.readlink(CURRENT).encode("utf-8"))
+    except OSError:
+        pass
+    try:
+        with os.scandir(RELEASES) as it:
+            names = sorted(e.name for e in it if e.is_dir(follow_symlinks=False) and not e.name.startswith("."))
+    except FileNotFoundError:
+        names = []
+    for name in names:
+        d = RELEASES / name
+        # same (mtime_ns, size) key as the parse cache, so both see a same-tick rewrite
+        h.update(f"\n{name}\0{stat_key(d / 'release.json')}\0{stat_key(d / 'validation_report.json')}".encode("utf-8"))
+    return f'W/"{h.hexdigest()[:32]}"'
+
+def move_to_trash(path: Path) -> Path:
+    """
+    Rename a directory to a hidden .trash-<uuid> sibling (a single metadata op).
+    The caller removes the returned path later, off the request path.
+    """
+    trash = path.parent / f".trash-{uuid.uuid4().hex}"
+    path.rename(trash)
+    return trash
+
+def validate_zip_structure(top_level: set[str]) -> tuple[bool, list[str]]:
+    """
+    top_level: first path component of every extracted member (see extract_zip).
+    """
     errors = []
-    if not (tmp_dir / "service").exists():
+    if "service" not in top_level:
         errors.append("Missing 'service/' directory")
-    if not (tmp_dir / "assets").exists():
+    if "assets" not in top_level:
         errors.append("Missing 'assets/' directory")
     # release.json optional at upload time
     return (len(errors) == 0, errors)
 
 
-def ensure_release_json(tmp_dir: Path, release_name: str, description: str, created_by: str, api_port: int):
+def ensure_release_json(tmp_dir: Path, release_name: str, description: str, created_by: str, api_port: int,
+                        data: dict | None = None):
+    """
+    data: release.json already parsed by the caller; read from tmp_dir otherwise.
+    """
     p = tmp_dir / "release.json"
-    if p.exists():
-        data = json.loads(p.read_text())
-    else:
-        data = {}
+    if data is None:
+        data = json_loads(p.read_bytes()) if p.exists() else {}
 
     # Fill minimal required fields
-    data["release_name"] = data.get("release_name", release_name)
-    data["project_name"] = data.get("project_name", "generic-service")
-    data["service_type"] = data.get("service_type", "fastapi")
-    data["entrypoint"] = data.get("entrypoint", "service.app:app")
-    data["api_port"] = int(data.get("api_port", api_port))
+    data.setdefault("release_name", release_name)
+    data.setdefault("project_name", "generic-service")
+    data.setdefault("service_type", "fastapi")
+    data.setdefault("entrypoint", "service.app:app")
+    data["api_port"] = int(data.setdefault("api_port", api_port))
     data["created_at"] = datetime.now(timezone.utc).isoformat()
     data["created_by"] = created_by
-    data["description"] = data.get("description", description)
-    data["healthcheck"] = data.get("healthcheck", {"path": "/health", "method": "GET"})
-    p.write_text(json.dumps(data, indent=2))
+    data.setdefault("description", description)
+    data.setdefault("healthcheck", {"path": "/health", "method": "GET"})
+    p.write_bytes(json_dumps_pretty(data))
     return data
 
-def build_canonical_zip(release_dir: Path):
-    out_zip = release_dir / "release_bundle.zip"
-    if out_zip.exists():
-        out_zip.unlink()
+def open_upload_zip(fileobj) -> zipfile.ZipFile:
+    """
+    Open the uploaded ZIP directly from the request's spooled file.
+    zipfile needs a seekable source; if it isn't, copy it to a temp file first.
+    The central directory is parsed once here; don't add testzip() - every
+    member's CRC is already checked as extraction reads it.
+    """
+    try:
+        seekable = fileobj.seekable()
+    except Exception:
+        seekable = False
+
+    if not seekable:
+        # spill next to the extraction dir rather than into a possibly small /tmp
+        tmp = tempfile.TemporaryFile(dir=UPLOADS)
+        shutil.copyfileobj(fileobj, tmp, length=UPLOAD_CHUNK_SIZE)
+        fileobj = tmp
+
+    fileobj.seek(0)
+    return zipfile.ZipFile(fileobj, "r")
 
-    with zipfile.ZipFile(out_zip, "w", zipfile.ZIP_DEFLATED) as z:
-        for root, _, files in os.walk(release_dir):
+def extract_zip(z: zipfile.ZipFile, dest: Path,
+                bundle: zipfile.ZipFile | None = None) -> tuple[set[str], list[str], bytes | None]:
+    """
+    extractall() equivalent that streams each member with a large buffer.
+    Member names are sanitized like zipfile does: empty, "." and ".." parts
+    are dropped so nothing lands outside dest.
+
+    Collects what later steps need in the same pass, so the tree isn't walked
+    again: (top-level names, extracted file arcnames, raw root release.json).
+    The root release.json is returned rather than written; ensure_release_json
+    writes the filled-in version.
+
+    bundle: the release_bundle.zip being written; every bundled member is
+    copied into it from the same chunks that go to disk. Members are taken in
+    sanitized-arcname order so the bundle gets the canonical layout (see
+    bundle_sort_key); finish_fused_bundle appends the trailing metadata files.
+    """
+    top_level = set()
+    files = []
+    release_json = None
+    members = []
+    for info in z.infolist():
+        parts = [p for p in info.filename.split("/") if p not in ("", ".", "..")]
+        if parts:
+            members.append(("/".join(parts), parts, info))
+    members.sort(key=lambda m: bundle_sort_key(m[0]))
+    for _, parts, info in members:
+        top_level.add(parts[0])
+        target = dest.joinpath(*parts)
+        if info.is_dir():
+            target.mkdir(parents=True, exist_ok=True)
+            continue
+        if parts == ["release.json"]:
+            release_json = z.read(info)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        arcname = "/".join(parts)
+        with z.open(info) as src, open(target, "wb") as dst:
+            if bundle is None or bundle_excluded(tuple(parts)):
+                shutil.copyfileobj(src, dst, length=IO_BUFFER_SIZE)
+            else:
+                binfo = zipfile.ZipInfo(arcname, date_time=info.date_time)
+                binfo.external_attr = 0o644 << 16
+                binfo.file_size = info.file_size  # lets zipfile pick zip64 up front
+                binfo.compress_type = member_compression(arcname, bundle.compression)
+                with bundle.open(binfo, "w") as bdst:
+                    while chunk := src.read(IO_BUFFER_SIZE):
+                        dst.write(chunk)
+                        bdst.write(chunk)
+        files.append(arcname)
+    return top_level, files, release_json
+
+# written after the rest of the tree (upload fills release.json, validation
+# writes the report), so every bundle carries them last, in this order
+BUNDLE_TRAILER = ("release.json", "validation_report.json")
+
+def bundle_sort_key(arcname: str) -> tuple[int, str]:
+    # canonical member order: arcname order, then BUNDLE_TRAILER
+    if arcname in BUNDLE_TRAILER:
+        return 1 + BUNDLE_TRAILER.index(arcname), arcname
+    return 0, arcname
+
+def bundle_excluded(rel_parts: tuple[str, ...]) -> bool:
+    # the bundle itself, its sidecar and local state that is rebuilt per host
+    if rel_parts[-1] in BUNDLE_EXCLUDED_FILES or rel_parts[-1].startswith(BUNDLE_PART_PREFIX):
+        return True
+    return any(p in BUNDLE_EXCLUDED_DIRS for p in rel_parts[:-1])
+
+def bundle_entries(release_dir: Path, arcnames: list[str] | None = None) -> list[tuple[Path, str, os.stat_result]]:
+    """
+    Files that go into release_bundle.zip, as (path, arcname, stat) in canonical
+    member order (bundle_sort_key).
+    arcnames: the release's files when already known (fresh upload); walks the tree otherwise.
+    """
+    entries = []
+    if arcnames is not None:
+        for arcname in set(arcnames):
+            if bundle_excluded(tuple(arcname.split("/"))):
+                continue
+            fp = release_dir / arcname
+            try:
+                entries.append((fp, arcname, fp.stat()))
+            except FileNotFoundError:
+                continue
+    else:
+        for root, dirs, files in os.walk(release_dir):
+            dirs[:] = [d for d in dirs if d not in BUNDLE_EXCLUDED_DIRS]
             for f in files:
-                fp = Path(root) / f
-                rel = fp.relative_to(release_dir)
-                # do not include itself recursively
-                if rel.name == "release_bundle.zip":
+                if f in BUNDLE_EXCLUDED_FILES or f.startswith(BUNDLE_PART_PREFIX):
                     continue
-                z.write(fp, str(rel))
+                fp = Path(root) / f
+                entries.append((fp, fp.relative_to(release_dir).as_posix(), fp.stat()))
+    entries.sort(key=lambda e: bundle_sort_key(e[1]))
+    return entries
+
+def bundle_manifest_hash(entries: list[tuple[Path, str, os.stat_result]]) -> str:
+    """
+    Fingerprint of the bundle contents: sha256 over (arcname, size, mtime_ns),
+    seeded with the compression settings so changing either rebuilds bundles.
+    """
+    h = hashlib.sha256(f"{BUNDLE_COMPRESSION}\0{BUNDLE_COMPRESSLEVEL}".encode("utf-8"))
+    for _, arcname, st in entries:
+        h.update(f"{arcname}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+def bundle_is_fresh(release_dir: Path, digest: str) -> bool:
+    out_zip = release_dir / "release_bundle.zip"
+    sidecar = release_dir / "release_bundle.zip.sha"
+    if not (out_zip.exists() and sidecar.exists()):
+        return False
+    return sidecar.read_text(encoding="utf-8").strip() == digest
+
+def build_canonical_zip(release_dir: Path, arcnames: list[str] | None = None):
+    """
+    Build release_bundle.zip, unless the existing bundle already matches the tree
+    (manifest hash stored in release_bundle.zip.sha).
+    """
+    out_zip = release_dir / "release_bundle.zip"
+    sidecar = release_dir / "release_bundle.zip.sha"
+
+    entries = bundle_entries(release_dir, arcnames)
+    digest = bundle_manifest_hash(entries)
+    if bundle_is_fresh(release_dir, digest):
+        return out_zip
+
+    sidecar.unlink(missing_ok=True)
+
+    # written next to the bundle and renamed over it: a download (or nginx)
+    # never sees a half-written file
+    part = release_dir / f"{BUNDLE_PART_PREFIX}{uuid.uuid4().hex}"
+    compression = BUNDLE_COMPRESSION_TYPES.get(BUNDLE_COMPRESSION, zipfile.ZIP_STORED)
+    try:
+        with open(part, "wb", buffering=IO_BUFFER_SIZE) as raw, \
+                zipfile.ZipFile(raw, "w", compression, allowZip64=True, compresslevel=BUNDLE_COMPRESSLEVEL) as z:
+            if compression == zipfile.ZIP_DEFLATED:
+                write_deflated_parallel(z, entries)
+            else:
+                for fp, arcname, _ in entries:
+                    zip_write_file(z, fp, arcname)
+        os.replace(part, out_zip)
+    finally:
+        part.unlink(missing_ok=True)
+
+    sidecar.write_text(digest, encoding="utf-8")
     return out_zip
 
-@app.get("/", include_in_schema=False)
-def root():
-    return RedirectResponse(url="/admin/", status_code=302)
+# releases with a bundle rebuild queued or running (one at a time per release)
+_bundle_rebuilds: set[str] = set()
+_bundle_rebuilds_lock = threading.Lock()
 
-@app.get("/admin")
-@app.get("/admin/")
-def admin_root():
-    return RedirectResponse(url="/admin/install", status_code=303)
+def rebuild_bundle(release_dir: Path) -> None:
+    """
+    Background refresh of a stale release_bundle.zip, so later downloads are
+    served from disk (or by nginx) again. No-op if one is already in flight.
+    """
+    key = str(release_dir)
+    with _bundle_rebuilds_lock:
+        if key in _bundle_rebuilds:
+            return
+        _bundle_rebuilds.add(key)
+    try:
+        if release_dir.exists():
+            build_canonical_zip(release_dir)
+    except OSError:
+        # deleted or renamed meanwhile: the next download tries again
+        pass
+    finally:
+        with _bundle_rebuilds_lock:
+            _bundle_rebuilds.discard(key)
+
+def member_compression(arcname: str, compression: int) -> int:
+    if os.path.splitext(arcname)[1].lower() in INCOMPRESSIBLE_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return compression
+
+def finish_fused_bundle(release_dir: Path, part: Path, extracted: list[tuple[Path, str, os.stat_result]],
+                        files: list[str]) -> Path:
+    """
+    Complete a bundle written during extraction: append release.json and the
+    validation report, then move it into place. If the extracted files changed
+    since they were recorded in `extracted`, rebuild from the tree instead.
+    """
+    def fingerprint(entries):
+        return [(arcname, st.st_size, st.st_mtime_ns) for _, arcname, st in entries]
 
-@app.post("/admin/upload")
-def upload_release(
-    file: UploadFile = File(...),
-    release_name: str = Form(...),
-    description: str = Form(""),
-    api_port: int = Form(8000),
-    created_by: str = Form("admin")
-):
-    rname = safe_name(release_name)
-    if not rname:
-        return RedirectResponse(url="/admin/install", status_code=303)
+    if fingerprint(bundle_entries(release_dir, files)) != fingerprint(extracted):
+        return build_canonical_zip(release_dir)
 
-    if (RELEASES / rname).exists():
-        # refuse overwrite for MVP
-        return RedirectResponse(url="/admin/install", status_code=303)
+    with zipfile.ZipFile(part, "a", BUNDLE_COMPRESSION_TYPES.get(BUNDLE_COMPRESSION, zipfile.ZIP_STORED),
+                         allowZip64=True, compresslevel=BUNDLE_COMPRESSLEVEL) as z:
+        for name in BUNDLE_TRAILER:
+            if (release_dir / name).exists():
+                zip_write_file(z, release_dir / name, name)
+
+    out_zip = release_dir / "release_bundle.zip"
+    try:
+        os.replace(part, out_zip)
+    except OSError as e:
+        # UPLOADS on another filesystem than the release
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(str(part), str(out_zip))
+    digest = bundle_manifest_hash(bundle_entries(release_dir, files + list(BUNDLE_TRAILER)))
+    (release_dir / "release_bundle.zip.sha").write_text(digest, encoding="utf-8")
+    return out_zip
+
+def zip_write_file(z: zipfile.ZipFile, fp: Path, arcname: str) -> None:
+    # ZipFile.write() equivalent that copies with IO_BUFFER_SIZE instead of 8 KiB
+    zinfo = zipfile.ZipInfo.from_file(fp, arcname)
+    zinfo.compress_type = member_compression(arcname, z.compression)
+    with open(fp, "rb") as src, z.open(zinfo, "w") as dst:
+        shutil.copyfileobj(src, dst, length=IO_BUFFER_SIZE)
+
+def deflate_member(path: Path) -> tuple[int, int, bytes]:
+    """
+    Raw-deflate one file; runs in a worker process. The file is mapped rather
+    than read, and CRC and compression each take the whole buffer in one call.
+    Returns (crc32, file_size, compressed_payload).
+    """
+    co = zlib.compressobj(BUNDLE_COMPRESSLEVEL, zlib.DEFLATED, -15)
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, 0, co.flush()
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            crc = zlib.crc32(mm)
+            payload = co.compress(mm) + co.flush()
+    return crc, size, payload
+
+def write_precompressed(z: zipfile.ZipFile, zinfo: zipfile.ZipInfo, crc: int, size: int, payload: bytes) -> None:
+    """
+    Append an already-deflated member: local header + payload, then register it
+    for the central directory (same bookkeeping ZipFile.mkdir does).
+    Uses private ZipFile internals (_writecheck, _didModify, fp, start_dir,
+    filelist, NameToInfo) as of CPython 3.10-3.13; precompressed_supported()
+    checks them once per process before the parallel path relies on this.
+    """
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.CRC = crc
+    zinfo.file_size = size
+    zinfo.compress_size = len(payload)
+    z._writecheck(zinfo)
+    z._didModify = True
+    zinfo.header_offset = z.fp.tell()
+    z.fp.write(zinfo.FileHeader())
+    z.fp.write(payload)
+    z.filelist.append(zinfo)
+    z.NameToInfo[zinfo.filename] = zinfo
+    z.start_dir = z.fp.tell()
+
+@lru_cache(maxsize=1)
+def precompressed_supported() -> bool:
+    """
+    Round trip through write_precompressed on this interpreter's zipfile: an
+    in-memory archive with a precompressed member followed by a regular one
+    must pass testzip() and read back. False sends builds to the serial path.
+    """
+    data = b"release-manager " * 64
+    try:
+        co = zlib.compressobj(BUNDLE_COMPRESSLEVEL, zlib.DEFLATED, -15)
+        payload = co.compress(data) + co.flush()
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+            write_precompressed(z, zipfile.ZipInfo("a.txt"), zlib.crc32(data), len(data), payload)
+            z.writestr("b.txt", data)
+        with zipfile.ZipFile(buf) as z:
+            return z.testzip() is None and z.read("a.txt") == data and z.read("b.txt") == data
+    except Exception:
+        return False
+
+_deflate_pool: ProcessPoolExecutor | None = None
+_deflate_pool_lock = threading.Lock()
+
+def deflate_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by every bundle build, started on first use so workers
+    are spawned once per server process rather than once per bundle.
+    """
+    global _deflate_pool
+    with _deflate_pool_lock:
+        if _deflate_pool is None:
+            # forkserver: workers don't inherit the threads/locks of the server process
+            ctx = multiprocessing.get_context("forkserver")
+            _deflate_pool = ProcessPoolExecutor(max_workers=DEFLATE_WORKERS, mp_context=ctx)
+        return _deflate_pool
+
+def reset_deflate_pool() -> None:
+    global _deflate_pool
+    with _deflate_pool_lock:
+        if _deflate_pool is not None:
+            _deflate_pool.shutdown(wait=False, cancel_futures=True)
+            _deflate_pool = None
+
+def write_deflated_parallel(z: zipfile.ZipFile, entries: list[tuple[Path, str, os.stat_result]]) -> None:
+    """
+    Parallel compress, serial write: members up to PARALLEL_DEFLATE_MAX_BYTES are
+    deflated in a process pool and written in their original order; larger ones
+    (and incompressible ones, stored) are streamed by zip_write_file so they are
+    never held in memory.
+    """
+    if not precompressed_supported():
+        # zipfile internals changed under write_precompressed: stream everything
+        for fp, arcname, _ in entries:
+            zip_write_file(z, fp, arcname)
+        return
+
+    ex = deflate_pool()
+    workers = DEFLATE_WORKERS
+    pending = deque()
+    todo = iter(entries)
+
+    def submit_next() -> bool:
+        for fp, arcname, st in todo:
+            if st.st_size <= PARALLEL_DEFLATE_MAX_BYTES and \
+                    member_compression(arcname, zipfile.ZIP_DEFLATED) == zipfile.ZIP_DEFLATED:
+                pending.append((fp, arcname, ex.submit(deflate_member, fp)))
+            else:
+                pending.append((fp, arcname, None))
+            return True
+        return False
+
+    # keep a bounded window in flight so memory stays ~2 x workers members
+    for _ in range(2 * workers):
+        if not submit_next():
+            break
+
+    while pending:
+        fp, arcname, fut = pending.popleft()
+        if fut is None:
+            zip_write_file(z, fp, arcname)
+        else:
+            try:
+                crc, size, payload = fut.result()
+            except BrokenProcessPool:
+                # a worker died; start a fresh pool for the next build
+                reset_deflate_pool()
+                raise
+            write_precompressed(z, zipfile.ZipInfo.from_file(fp, arcname), crc, size, payload)
+        submit_next()
+
+class _ZipStreamSink:
+    """
+    Write-only file object for zipfile: buffers written bytes until drained.
+    No tell()/seek(), so zipfile writes data descriptors (streamable output).
+    """
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
 
+def iter_canonical_zip(entries: list[tuple[Path, str, os.stat_result]]):
+    """
+    Yield the bundle ZIP bytes on the fly, without writing it to disk.
+    """
+    sink = _ZipStreamSink()
+    compression = BUNDLE_COMPRESSION_TYPES.get(BUNDLE_COMPRESSION, zipfile.ZIP_STORED)
+    with zipfile.ZipFile(sink, "w", compression, allowZip64=True, compresslevel=BUNDLE_COMPRESSLEVEL) as z:
+        for fp, arcname, _ in entries:
+            zinfo = zipfile.ZipInfo.from_file(fp, arcname)
+            zinfo.compress_type = member_compression(arcname, compression)
+            with fp.open("rb") as src, z.open(zinfo, "w") as dst:
+                while True:
+                    chunk = src.read(UPLOAD_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    data = sink.drain()
+                    if data:
+                        yield data
+            # data descriptor written on close
+            yield sink.drain()
+    # central directory written on close
+    yield sink.drain()
+
+@app.get("/", include_in_schema=False)
+@app.get("/admin", include_in_schema=False)
+@app.get("/admin/", include_in_schema=False)
+async def admin_root():
+    # single hop to the landing page (handlers also redirect straight to ADMIN_HOME)
+    return RedirectResponse(url=ADMIN_HOME, status_code=303)
+
+def install_uploaded_release(fileobj, rname: str, description: str, created_by: str,
+                             api_port: int) -> tuple[list[str], list[tuple[Path, str, os.stat_result]], Path] | None:
+    """
+    Blocking part of an upload: extract (writing the bundle alongside), fill
+    release.json and install. Returns (extracted file list, their stats as
+    bundled, partial bundle) for finalize_release, or None if the ZIP can't be
+    extracted or the name is taken.
+    """
     UPLOADS.mkdir(parents=True, exist_ok=True)
     tmp_id = uuid.uuid4().hex
-    zip_path = UPLOADS / f"{tmp_id}.zip"
     tmp_dir = UPLOADS / f"tmp_{tmp_id}"
     tmp_dir.mkdir(parents=True, exist_ok=True)
+    bundle_part = UPLOADS / f"bundle_{tmp_id}.zip"
 
-    with zip_path.open("wb") as f:
-        f.write(file.file.read())
-
-    # extract
+    # extract straight from the spooled upload (no intermediate ZIP on disk);
+    # one pass also yields what validation, release.json and the bundle need
+    compression = BUNDLE_COMPRESSION_TYPES.get(BUNDLE_COMPRESSION, zipfile.ZIP_STORED)
     try:
-        with zipfile.ZipFile(zip_path, "r") as z:
-            z.extractall(tmp_dir)
+        with open_upload_zip(fileobj) as z, \
+                open(bundle_part, "wb", buffering=IO_BUFFER_SIZE) as raw, \
+                zipfile.ZipFile(raw, "w", compression, allowZip64=True, compresslevel=BUNDLE_COMPRESSLEVEL) as bundle:
+            top_level, files, release_json = extract_zip(z, tmp_dir, bundle)
+        # stats of what went into the bundle, before the release becomes visible:
+        # finish_fused_bundle compares them to catch edits made in between
+        extracted = bundle_entries(tmp_dir, files)
     except Exception:
         shutil.rmtree(tmp_dir, ignore_errors=True)
-        zip_path.unlink(missing_ok=True)
-        return RedirectResponse(url="/admin/install", status_code=303)
+        bundle_part.unlink(missing_ok=True)
+        return None
 
     # validate structure (MVP: even invalid releases are installed for debugging)
-    ok, errors = validate_zip_structure(tmp_dir)
+    ok, errors = validate_zip_structure(top_level)
 
     # ensure release.json created/filled
-    ensure_release_json(tmp_dir, rname, description, created_by, api_port)
+    meta = json_loads(release_json) if release_json is not None else {}
+    ensure_release_json(tmp_dir, rname, description, created_by, api_port, data=meta)
 
-    # install release
+    # install release; mkdir claims the name atomically (a same-name upload that
+    # finished meanwhile makes it fail), then the tree replaces the empty claim
     dest = RELEASES / rname
-    shutil.move(str(tmp_dir), str(dest))
+    RELEASES.mkdir(parents=True, exist_ok=True)
+    try:
+        dest.mkdir()
+    except OSError:
+        # refuse overwrite for MVP
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        bundle_part.unlink(missing_ok=True)
+        return None
+    try:
+        try:
+            # UPLOADS and RELEASES share a filesystem: one atomic rename
+            os.rename(tmp_dir, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copytree(tmp_dir, dest, symlinks=True, dirs_exist_ok=True)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except OSError:
+        shutil.rmtree(dest, ignore_errors=True)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        bundle_part.unlink(missing_ok=True)
+        return None
+    return files, extracted, bundle_part
 
-    # unified validation (structure + deps + compile/import)
-    validate_release(dest)
+def finalize_release(release_path: Path, files: list[str], extracted: list[tuple[Path, str, os.stat_result]],
+                     bundle_part: Path) -> None:
+    """
+    Slow part of an upload, run after the response: validate, then complete
+    the bundle written during extraction (no re-read of the tree).
+    The release is listed without a status until the report is written.
+    """
+    try:
+        if not release_path.exists():
+            # deleted while queued
+            return
+        # unified validation (structure + deps + compile/import)
+        validate_release(release_path)
+        finish_fused_bundle(release_path, bundle_part, extracted, files)
+    finally:
+        bundle_part.unlink(missing_ok=True)
 
-    # build canonical zip
-    build_canonical_zip(dest)
+@app.post("/admin/upload")
+async def upload_release(
+    background: BackgroundTasks,
+    file: UploadFile = File(...),
+    release_name: str = Form(...),
+    description: str = Form(""),
+    api_port: int = Form(8000),
+    created_by: str = Form("admin")
+):
+    rname = safe_name(release_name)
+    if not rname:
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
-    # cleanup upload zip
-    zip_path.unlink(missing_ok=True)
+    if (RELEASES / rname).exists():
+        # refuse overwrite for MVP
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
-    return RedirectResponse(url="/admin/install", status_code=303)
+    # extract off the event loop while the upload is still open; validation
+    # subprocesses and zipping run after the redirect is sent
+    installed = await run_in_threadpool(install_uploaded_release, file.file, rname, description, created_by, api_port)
+    if installed is not None:
+        files, extracted, bundle_part = installed
+        background.add_task(finalize_release, RELEASES / rname, files, extracted, bundle_part)
+    return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
 
 @app.post("/admin/deploy/{release_name}")
-def deploy_release(release_name: str):
+async def deploy_release(release_name: str, background: BackgroundTasks):
 
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
-        return RedirectResponse(url="/admin", status_code=303)
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
     # ✅ Ensure /opt/release_manager exists (parent of CURRENT)
     CURRENT.parent.mkdir(parents=True, exist_ok=True)
 
     # ✅ BLOCK deploy if release is not VALID (must be validated first)
-    vpath = target / "validation_report.json"
-    is_valid = False
-
-    if vpath.exists():
-        try:
-            vj = json.loads(vpath.read_text(encoding="utf-8"))
-            is_valid = (vj.get("ok") is True)
-        except Exception:
-            is_valid = False
-
+    is_valid = (read_json_file(target / "validation_report.json").get("ok") is True)
     if not is_valid:
         return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
@@ -237,7 +923,7 @@ def deploy_release(release_name: str):
     # - check_missing_in_release_venv()
     try:
         required = get_required_pip_requirements(target)
-        missing = check_missing_in_release_venv(target, required)
+        missing = await run_in_threadpool(check_missing_in_release_venv, target, required)
     except Exception as e:
         (RUNTIME / "logs").mkdir(parents=True, exist_ok=True)
         (RUNTIME / "logs" / "last_deploy_error.txt").write_text(
@@ -266,37 +952,34 @@ def deploy_release(release_name: str):
         # 2) Remove current (symlink or dir)
         if CURRENT.exists() or CURRENT.is_symlink():
             if CURRENT.is_dir() and not CURRENT.is_symlink():
-                shutil.rmtree(CURRENT)
+                background.add_task(shutil.rmtree, move_to_trash(CURRENT), ignore_errors=True)
             else:
                 CURRENT.unlink(missing_ok=True)
 
         # 3) Set current -> new release
         CURRENT.symlink_to(target)
+        invalidate_service_output_cache()
 
-        # 4) Restart service
-        run(["sudo", "systemctl", "restart", SERVICE_NAME])
+        # 4) Restart service (queued; systemd does the stop/start while we poll)
+        prev_pid = await run_in_threadpool(service_main_pid)
+        await run_in_threadpool(run, ["sudo", "systemctl", "--no-block", "restart", SERVICE_NAME])
 
-        # 5) Healthcheck loop (a few tries)
+        # 5) Healthcheck poll with backoff, until HEALTH_TIMEOUT_SEC
         health_path = get_health_path(target)
-        ok = False
-        last_msg = ""
-        for _ in range(3):
-            ok, last_msg = http_healthcheck(SERVICE_PORT, health_path, timeout_sec=HEALTH_TIMEOUT_SEC)
-            if ok:
-                break
-            time.sleep(1)
+        ok, last_msg = await run_in_threadpool(wait_for_restart_health, prev_pid, health_path)
 
         # 6) Rollback if failed
         if not ok:
             if prev_target and prev_target.exists():
                 if CURRENT.exists() or CURRENT.is_symlink():
                     if CURRENT.is_dir() and not CURRENT.is_symlink():
-                        shutil.rmtree(CURRENT)
+                        background.add_task(shutil.rmtree, move_to_trash(CURRENT), ignore_errors=True)
                     else:
                         CURRENT.unlink(missing_ok=True)
 
                 CURRENT.symlink_to(prev_target)
-                run(["sudo", "systemctl", "restart", SERVICE_NAME])
+                invalidate_service_output_cache()
+                await run_in_threadpool(run, ["sudo", "systemctl", "--no-block", "restart", SERVICE_NAME])
 
             (RUNTIME / "logs").mkdir(parents=True, exist_ok=True)
             (RUNTIME / "logs" / "last_deploy_error.txt").write_text(
@@ -312,72 +995,95 @@ def deploy_release(release_name: str):
         )
         return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
-    return RedirectResponse(url="/admin", status_code=303)
+    return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
 
 @app.post("/admin/deactivate")
-def deactivate_service():
+async def deactivate_service(background: BackgroundTasks):
     """
     Stop deployed service and remove the current symlink.
     This allows deleting an ACTIVE release safely from the GUI.
     """
     try:
         # Stop service (no password via sudoers)
-        run(["sudo", "systemctl", "stop", SERVICE_NAME])
+        await run_in_threadpool(run, ["sudo", "systemctl", "stop", SERVICE_NAME])
 
         # Remove current (symlink or directory)
         if CURRENT.exists() or CURRENT.is_symlink():
             if CURRENT.is_dir() and not CURRENT.is_symlink():
-                shutil.rmtree(CURRENT)
+                background.add_task(shutil.rmtree, move_to_trash(CURRENT), ignore_errors=True)
             else:
                 CURRENT.unlink(missing_ok=True)
+        invalidate_service_output_cache()
 
     except Exception:
-        return RedirectResponse(url="/admin", status_code=303)
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
-    return RedirectResponse(url="/admin", status_code=303)
+    return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
 
 @app.get("/admin/download/{release_name}")
-def download_release(release_name: str):
+async def download_release(release_name: str, request: Request, background: BackgroundTasks):
     rname = safe_name(release_name)
     target = RELEASES / rname
-    bundle = target / "release_bundle.zip"
-    if not bundle.exists():
-        build_canonical_zip(target)
-    return FileResponse(path=bundle, filename=f"{rname}_release_bundle.zip")
+    if not target.exists():
+        return RedirectResponse(url="/admin/releases", status_code=303)
+
+    filename = f"{rname}_release_bundle.zip"
+    entries = await run_in_threadpool(bundle_entries, target)
+    if bundle_is_fresh(target, bundle_manifest_hash(entries)):
+        if X_ACCEL_DOWNLOADS:
+            # nginx serves the file itself from its internal location
+            return Response(
+                media_type="application/zip",
+                headers={
+                    "X-Accel-Redirect": f"{NGINX_INTERNAL_RELEASES}{rname}/release_bundle.zip",
+                    "Content-Disposition": f'attachment; filename="{filename}"',
+                },
+            )
+        bundle = target / "release_bundle.zip"
+        response = FileResponse(path=bundle, filename=filename, stat_result=bundle.stat())
+        response.chunk_size = IO_BUFFER_SIZE
+        return response
+
+    # missing/stale bundle: zip on the fly instead of rebuilding before the first
+    # byte, and refresh the one on disk afterwards
+    background.add_task(rebuild_bundle, target)
+    return StreamingResponse(
+        iter_canonical_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 @app.post("/admin/delete/{release_name}")
-def delete_release(release_name: str):
+async def delete_release(release_name: str, background: BackgroundTasks):
     rname = safe_name(release_name)
     target = RELEASES / rname
+    if not rname or not target.exists():
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
     # do not delete active
-    if CURRENT.exists() and CURRENT.resolve() == target.resolve():
-        return RedirectResponse(url="/admin", status_code=303)
+    if is_active_release(rname):
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
-    shutil.rmtree(target, ignore_errors=True)
-    return RedirectResponse(url="/admin", status_code=303)
+    # rename now, unlink the tree after the response is sent
+    background.add_task(shutil.rmtree, move_to_trash(target), ignore_errors=True)
+    return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
 @app.get("/admin/release/{release_name}")
-def release_detail_page(release_name: str, request: Request):
+async def release_detail_page(release_name: str, request: Request):
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
         return RedirectResponse(url="/admin/releases", status_code=303)
 
     # ACTIVE?
-    active = False
-    if CURRENT.exists():
-        try:
-            active = CURRENT.resolve() == target.resolve()
-        except Exception:
-            active = False
+    active = is_active_release(rname)
 
     # read release.json for description
     rj_path = target / "release.json"
     release_json_text = rj_path.read_text(encoding="utf-8") if rj_path.exists() else "{}"
     try:
-        rj = json.loads(release_json_text)
+        rj = json_loads(release_json_text)
     except Exception:
         rj = {}
 
@@ -399,15 +1105,22 @@ def release_detail_page(release_name: str, request: Request):
 
     description = rj.get("description", "")
 
+    # read the validation report once: None if missing, parse error kept for the summary
+    vj = None
+    vj_error = False
+    try:
+        vj = json_loads((target / "validation_report.json").read_bytes())
+        if not isinstance(vj, dict):
+            raise ValueError("validation report is not an object")
+    except FileNotFoundError:
+        pass
+    except Exception:
+        vj, vj_error = None, True
+
     # determine validation status
     status = "NOT_VALIDATED"
-    vpath = target / "validation_report.json"
-    if vpath.exists():
-        try:
-            vj = json.loads(vpath.read_text(encoding="utf-8"))
-            status = "VALID" if vj.get("ok") is True else "NOT_VALIDATED"
-        except Exception:
-            status = "NOT_VALIDATED"
+    if vj is not None and vj.get("ok") is True:
+        status = "VALID"
 
     if active:
         status = "ACTIVE"
@@ -420,39 +1133,39 @@ def release_detail_page(release_name: str, request: Request):
         "message": "No validation report found yet.",
     }
 
-    if vpath.exists():
+    if vj_error:
         validation_summary["exists"] = True
-        try:
-            vj = json.loads(vpath.read_text(encoding="utf-8"))
-            ok = (vj.get("ok") is True)
-            validation_summary["ok"] = ok
-            validation_summary["timestamp"] = vj.get("timestamp_utc")
-
-            # Compact message: errors > output > fallback
-            if not ok:
-                errs = vj.get("errors")
-                if isinstance(errs, list) and len(errs) > 0:
-                    validation_summary["message"] = " | ".join(str(x) for x in errs[:3])
-                else:
-                    out = vj.get("output")
-                    if isinstance(out, str) and out.strip():
-                        validation_summary["message"] = out.strip().splitlines()[-1][:160]
-                    else:
-                        validation_summary["message"] = "Validation failed (no details)."
-            else:
-                validation_summary["message"] = "Validation OK."
-        except Exception:
-            validation_summary["ok"] = False
-            validation_summary["message"] = "Validation report exists but could not be parsed."
+        validation_summary["ok"] = False
+        validation_summary["message"] = "Validation report exists but could not be parsed."
+    elif vj is not None:
+        validation_summary["exists"] = True
+        ok = (vj.get("ok") is True)
+        validation_summary["ok"] = ok
+        validation_summary["timestamp"] = vj.get("timestamp_utc")
 
+        # Compact message: errors > output > fallback
+        if not ok:
+            errs = vj.get("errors")
+            if isinstance(errs, list) and len(errs) > 0:
+                validation_summary["message"] = " | ".join(str(x) for x in errs[:3])
+            else:
+                out = vj.get("output")
+                if isinstance(out, str) and out.strip():
+                    validation_summary["message"] = out.strip().splitlines()[-1][:160]
+                else:
+                    validation_summary["message"] = "Validation failed (no details)."
+        else:
+            validation_summary["message"] = "Validation OK."
 
     # read main "service/app.py"
     main_path = target / "service" / "app.py"
     main_py = main_path.read_text(encoding="utf-8") if main_path.exists() else ""
 
-    # get service status + logs
-    service_status = service_status_text()
-    service_logs = service_logs_text()
+    # get service status + logs (both subprocesses run concurrently)
+    service_status, service_logs = await asyncio.gather(
+        run_in_threadpool(service_status_text),
+        run_in_threadpool(service_logs_text),
+    )
 
     r = {"name": rname, "status": status, "description": description}
 
@@ -474,7 +1187,7 @@ def release_detail_page(release_name: str, request: Request):
     )
 
 @app.post("/admin/release/{release_name}/clone")
-def clone_release(release_name: str):
+async def clone_release(release_name: str):
     rname = safe_name(release_name)
     src = RELEASES / rname
     if not src.exists():
@@ -483,7 +1196,7 @@ def clone_release(release_name: str):
     new_name = next_copy_name(rname)
     dst = RELEASES / new_name
 
-    shutil.copytree(src, dst)
+    await run_in_threadpool(clone_tree, src, dst)
 
     # mark as NOT_VALIDATED by default (optional)
     write_validation_report(dst, False, {"errors": ["Cloned release (requires validation after edits)"]})
@@ -492,59 +1205,55 @@ def clone_release(release_name: str):
 
 
 @app.post("/admin/release/{release_name}/update_main")
-def update_main(release_name: str, content: str = Form(...)):
+async def update_main(release_name: str, content: str = Form(...)):
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
         return RedirectResponse(url="/admin/releases", status_code=303)
 
     # block update if ACTIVE
-    if CURRENT.exists():
-        try:
-            if CURRENT.resolve() == target.resolve():
-                return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
-        except Exception:
-            pass
+    if is_active_release(rname):
+        return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
     main_path = target / "service" / "app.py"
     main_path.write_text(content, encoding="utf-8")
 
-    validate_release(target)
+    await run_in_threadpool(validate_release, target)
     return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
 
 @app.post("/admin/release/{release_name}/update_release_json")
-def update_release_json(release_name: str, content: str = Form(...)):
+async def update_release_json(release_name: str, content: str = Form(...)):
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
         return RedirectResponse(url="/admin/releases", status_code=303)
 
     # block update if ACTIVE
-    if CURRENT.exists():
-        try:
-            if CURRENT.resolve() == target.resolve():
-                return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
-        except Exception:
-            pass
+    if is_active_release(rname):
+        return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
     # basic JSON validation
     try:
-        json.loads(content)
+        json_loads(content)
     except Exception:
         write_validation_report(target, False, {"errors": ["release.json is not valid JSON"]})
         return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
     (target / "release.json").write_text(content, encoding="utf-8")
 
-    validate_release(target)
+    await run_in_threadpool(validate_release, target)
     return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
 
 @app.get("/admin/install")
-def install_page(request: Request):
-    releases = list_releases()  # usa tu función actual
-    return templates.TemplateResponse(
+async def install_page(request: Request):
+    etag = await run_in_threadpool(releases_etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    releases = await run_in_threadpool(list_releases)
+    response = templates.TemplateResponse(
         "install.html",
         {
             "request": request,
@@ -555,11 +1264,17 @@ def install_page(request: Request):
             "releases": releases,
         },
     )
+    response.headers["ETag"] = etag
+    return response
 
 @app.get("/admin/releases")
-def releases_page(request: Request):
-    releases = list_releases()
-    return templates.TemplateResponse(
+async def releases_page(request: Request):
+    etag = await run_in_threadpool(releases_etag)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    releases = await run_in_threadpool(list_releases)
+    response = templates.TemplateResponse(
         "releases.html",
         {
             "request": request,
@@ -570,21 +1285,19 @@ def releases_page(request: Request):
             "releases": releases,
         },
     )
+    response.headers["ETag"] = etag
+    return response
 
 @app.post("/admin/release/{release_name}/install_missing_deps")
-def install_missing_deps(release_name: str):
+async def install_missing_deps(release_name: str):
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
-        return RedirectResponse(url="/admin/install", status_code=303)
+        return RedirectResponse(url=ADMIN_HOME, status_code=303)
 
     # safety: do not modify deps while ACTIVE
-    if CURRENT.exists():
-        try:
-            if CURRENT.resolve() == target.resolve():
-                return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
-        except Exception:
-            pass
+    if is_active_release(rname):
+        return RedirectResponse(url=f"/admin/release/{rname}", status_code=303)
 
     # start background thread (simple MVP)
     def _worker():
@@ -600,7 +1313,7 @@ def install_missing_deps(release_name: str):
 
 
 @app.get("/admin/release/{release_name}/deps_status")
-def deps_status(release_name: str):
+async def deps_status(release_name: str):
     rname = safe_name(release_name)
     target = RELEASES / rname
     if not target.exists():
@@ -611,25 +1324,69 @@ def deps_status(release_name: str):
 
 # Helpers
 
-def http_healthcheck(port: int, path: str, timeout_sec: int = 8) -> tuple[bool, str]:
-    url = f"http://127.0.0.1:{port}{path}"
+def http_healthcheck(port: int, path: str, timeout_sec: float = 8,
+                     conn: http.client.HTTPConnection | None = None) -> tuple[bool, str]:
+    """
+    GET http://127.0.0.1:<port><path>. Pass conn to reuse one keep-alive
+    connection across retries; it reconnects by itself after a failure.
+    """
+    own = conn is None
+    if own:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout_sec)
+    else:
+        conn.timeout = timeout_sec
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout_sec)
     try:
-        with urllib.request.urlopen(url, timeout=timeout_sec) as resp:
-            body = resp.read().decode("utf-8", errors="ignore")
-            if 200 <= resp.status < 300:
-                return True, body[:500]
-            return False, f"HTTP {resp.status}: {body[:200]}"
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        # read the whole body so the connection can be reused
+        body = resp.read().decode("utf-8", errors="ignore")
+        if 200 <= resp.status < 300:
+            return True, body[:500]
+        return False, f"HTTP {resp.status}: {body[:200]}"
     except Exception as e:
+        conn.close()
         return False, str(e)
+    finally:
+        if own:
+            conn.close()
 
-def load_release_json(release_path: Path) -> dict:
-    p = release_path / "release.json"
-    if not p.exists():
-        return {}
+def service_main_pid() -> str:
+    # "" if unknown, "0" while the unit has no running main process
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
-    except Exception:
-        return {}
+        rc, out = run(["systemctl", "show", "-p", "MainPID", "--value", SERVICE_NAME])
+    except OSError:
+        return ""
+    return out.strip() if rc == 0 else ""
+
+def wait_for_restart_health(prev_pid: str, health_path: str) -> tuple[bool, str]:
+    """
+    Poll after a --no-block restart: 0.1s, 0.2s, ... (capped at 1.6s) until
+    HEALTH_TIMEOUT_SEC. A healthy answer only counts once MainPID differs from
+    prev_pid, so the old process can't pass the check before it is stopped.
+    """
+    deadline = time.monotonic() + HEALTH_TIMEOUT_SEC
+    delay = 0.1
+    last_msg = "service did not restart"
+    conn = http.client.HTTPConnection("127.0.0.1", SERVICE_PORT, timeout=HEALTH_TIMEOUT_SEC)
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False, last_msg
+            pid = service_main_pid()
+            if not prev_pid or pid not in ("", "0", prev_pid):
+                ok, last_msg = http_healthcheck(SERVICE_PORT, health_path, max(remaining, 0.1), conn=conn)
+                if ok:
+                    return True, last_msg
+            time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+            delay = min(delay * 2, 1.6)
+    finally:
+        conn.close()
+
+def load_release_json(release_path: Path) -> dict:
+    return read_json_file(release_path / "release.json")
 
 def get_health_path(release_path: Path) -> str:
     rj = load_release_json(release_path)
@@ -640,40 +1397,77 @@ def get_health_path(release_path: Path) -> str:
     return path
 
 def read_json_file(path: Path) -> dict:
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:
+    k = stat_key(path)
+    if k is None:
         return {}
+    return parse_json_cached(str(path), k)
+
+# systemctl/journalctl output per command, reused for SERVICE_OUTPUT_TTL_SEC so
+# concurrent page refreshes share one subprocess
+SERVICE_OUTPUT_TTL_SEC = 2.0
+_service_output_cache: dict[str, tuple[float, str]] = {}
+_service_output_locks = {"status": threading.Lock(), "logs": threading.Lock()}
+
+def cached_service_output(key: str, fetch: Callable[[], str]) -> str:
+    cached = _service_output_cache.get(key)
+    if cached and time.monotonic() - cached[0] <= SERVICE_OUTPUT_TTL_SEC:
+        return cached[1]
+    with _service_output_locks[key]:
+        # another request may have refreshed it while we waited
+        cached = _service_output_cache.get(key)
+        if cached and time.monotonic() - cached[0] <= SERVICE_OUTPUT_TTL_SEC:
+            return cached[1]
+        out = fetch()
+        _service_output_cache[key] = (time.monotonic(), out)
+        return out
+
+def invalidate_service_output_cache() -> None:
+    _service_output_cache.clear()
+
+def service_status_text() -> str:
+    return cached_service_output("status", lambda: run(["sudo", "systemctl", "status", SERVICE_NAME, "--no-pager"])[1])
 
-def list_tree(root: Path, max_depth: int = 2) -> list[str]:
+def journal_tail(unit: str, n: int) -> str | None:
     """
-    Simple tree listing (no recursion explosion)
+    Last n journal lines of a unit, read in-process with python-systemd
+    (journalctl-like format). None if the binding is missing, the journal can't
+    be read or nothing is visible (e.g. user not in systemd-journal).
     """
-    out = []
-    root = root.resolve()
-    for p in sorted(root.rglob("*")):
+    if journal is None:
+        return None
+    try:
+        r = journal.Reader()
         try:
-            rel = p.relative_to(root)
-        except Exception:
-            continue
-        depth = len(rel.parts)
-        if depth > max_depth:
-            continue
-        if p.is_dir():
-            out.append(f"{rel.as_posix()}/")
-        else:
-            out.append(rel.as_posix())
-    return out
-
-def service_status_text() -> str:
-    rc, out = run(["sudo", "systemctl", "status", SERVICE_NAME, "--no-pager"])
-    return out
+            r.add_match(_SYSTEMD_UNIT=f"{unit}.service")
+            r.seek_tail()
+            entries = []
+            for _ in range(n):
+                e = r.get_previous()
+                if not e:
+                    break
+                entries.append(e)
+        finally:
+            r.close()
+    except Exception:
+        return None
+    if not entries:
+        return None
+    lines = []
+    for e in reversed(entries):
+        ts = e.get("__REALTIME_TIMESTAMP")
+        stamp = ts.strftime("%b %d %H:%M:%S") if ts else "-"
+        ident = e.get("SYSLOG_IDENTIFIER") or unit
+        pid = e.get("_PID")
+        lines.append(f"{stamp} {ident}[{pid}]: {e.get('MESSAGE', '')}" if pid else f"{stamp} {ident}: {e.get('MESSAGE', '')}")
+    return "\n".join(lines) + "\n"
 
 def service_logs_text() -> str:
-    rc, out = run(["sudo", "journalctl", "-u", SERVICE_NAME, "-n", "50", "--no-pager"])
-    return out
+    def fetch() -> str:
+        out = journal_tail(SERVICE_NAME, 50)
+        if out is None:
+            out = run(["sudo", "journalctl", "-u", SERVICE_NAME, "-n", "50", "--no-pager"])[1]
+        return out
+    return cached_service_output("logs", fetch)
 
 
 def write_validation_report(release_path: Path, ok: bool, detail: dict) -> None:
@@ -682,38 +1476,109 @@ def write_validation_report(release_path: Path, ok: bool, detail: dict) -> None:
         "timestamp_utc": datetime.utcnow().isoformat() + "Z",
         **detail,
     }
-    (release_path / "validation_report.json").write_text(
-        json.dumps(report, indent=2),
-        encoding="utf-8",
+    (release_path / "validation_report.json").write_bytes(
+        json_dumps_pretty(report)
     )
 
-def check_missing_in_release_venv(release_path: Path, pip_requirements: list[str]) -> list[str]:
+# venv python path -> (site-packages mtime_ns, canonical names of installed distributions)
+_installed_cache: dict[str, tuple[int, set[str]]] = {}
+# venv python path -> (site-packages mtime_ns, requirements, missing requirements)
+_missing_cache: dict[str, tuple[int, tuple[str, ...], list[str]]] = {}
+
+def release_site_packages(release_path: Path) -> Path | None:
+    return next((release_path / ".venv" / "lib").glob("python*/site-packages"), None)
+
+def scan_installed_names(site_packages: Path) -> set[str]:
     """
-    Returns missing requirements *as requirement strings* (not only names).
-    Compares canonical names vs installed distributions.
+    Installed distribution names from the *.dist-info / *.egg-info entries of
+    site-packages ("<name>-<version>.dist-info"), without starting the venv python.
     """
-    if not pip_requirements:
-        return []
+    installed = set()
+    with os.scandir(site_packages) as it:
+        for e in it:
+            if e.name.endswith(".dist-info"):
+                stem = e.name[: -len(".dist-info")]
+            elif e.name.endswith(".egg-info"):
+                stem = e.name[: -len(".egg-info")]
+            else:
+                continue
+            name = stem.split("-", 1)[0] if "-" in stem else metadata_name(e.path)
+            if name:
+                installed.add(canonicalize_name(name))
+    return installed
+
+def metadata_name(info_path: str) -> str:
+    # Name: header of METADATA (dist-info) or PKG-INFO (egg-info)
+    for fname in ("METADATA", "PKG-INFO"):
+        try:
+            with open(os.path.join(info_path, fname), encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if line.startswith("Name:"):
+                        return line[len("Name:"):].strip()
+                    if not line.strip():
+                        break
+        except OSError:
+            continue
+    return ""
 
+def release_installed_names(release_path: Path) -> set[str] | None:
+    """
+    Canonical names installed in the release venv, or None if the probe fails.
+    Read from site-packages and cached until it changes (installs/uninstalls add
+    or remove its *.dist-info entries, which bumps the directory mtime).
+    """
     py = release_venv_python(release_path)
-    if not py.exists():
-        # if venv doesn't exist, everything is missing
-        return pip_requirements[:]  # keep full req strings
-
-    # Ask the venv python what distributions exist
+    sp = release_site_packages(release_path)
+    sp_mtime = mtime_ns(sp) if sp is not None else None
+    cached = _installed_cache.get(str(py))
+    if cached and sp_mtime is not None and cached[0] == sp_mtime:
+        return cached[1]
+
+    if sp_mtime is not None:
+        installed = scan_installed_names(sp)
+        _installed_cache[str(py)] = (sp_mtime, installed)
+        return installed
+
+    # no site-packages found: ask the venv python what distributions exist
     cmd = (
         "import importlib.metadata as m;"
         "print('\\n'.join([(d.metadata.get('Name') or '').strip() for d in m.distributions()]))"
     )
     rc, out = run([str(py), "-c", cmd])
     if rc != 0:
-        return pip_requirements[:]
+        return None
 
     installed = set()
     for line in out.splitlines():
         name = line.strip()
         if name:
             installed.add(canonicalize_name(name))
+    return installed
+
+def check_missing_in_release_venv(release_path: Path, pip_requirements: list[str]) -> list[str]:
+    """
+    Returns missing requirements *as requirement strings* (not only names).
+    Compares canonical names vs installed distributions.
+    """
+    if not pip_requirements:
+        return []
+
+    py = release_venv_python(release_path)
+    if not py.exists():
+        # if venv doesn't exist, everything is missing
+        return pip_requirements[:]  # keep full req strings
+
+    # same requirements against an unchanged site-packages: same answer
+    reqs = tuple(pip_requirements)
+    sp = release_site_packages(release_path)
+    sp_mtime = mtime_ns(sp) if sp is not None else None
+    cached = _missing_cache.get(str(py))
+    if cached and sp_mtime is not None and cached[0] == sp_mtime and cached[1] == reqs:
+        return cached[2][:]
+
+    installed = release_installed_names(release_path)
+    if installed is None:
+        return pip_requirements[:]
 
     missing = []
     for req in pip_requirements:
@@ -722,14 +1587,24 @@ def check_missing_in_release_venv(release_path: Path, pip_requirements: list[str
             missing.append(req)  # keep original req string
 
     # unique ordered
-    seen = set()
-    ordered = []
-    for r in missing:
-        if r not in seen:
-            seen.add(r)
-            ordered.append(r)
-    return ordered
-
+    missing = list(dict.fromkeys(missing))
+    if sp_mtime is not None:
+        _missing_cache[str(py)] = (sp_mtime, reqs, missing)
+    return missing[:]
+
+
+# Run by the release venv python (cwd = release dir): compile, then import.
+# A compile error exits with PY_COMPILE_FAILED_RC; an import error exits 1.
+PY_COMPILE_FAILED_RC = 3
+VALIDATE_APP_SCRIPT = (
+    "import py_compile, sys\n"
+    "try:\n"
+    "    py_compile.compile('service/app.py', doraise=True)\n"
+    "except py_compile.PyCompileError as e:\n"
+    "    print(e.msg)\n"
+    f"    sys.exit({PY_COMPILE_FAILED_RC})\n"
+    "import service.app\n"
+)
 
 def validate_release(release_path: Path) -> tuple[bool, str]:
     """
@@ -782,36 +1657,57 @@ def validate_release(release_path: Path) -> tuple[bool, str]:
         write_validation_report(release_path, False, {"errors": [msg], **details})
         return False, msg
 
-    # 4) Compile inside per-release venv
-    rc1, out1 = run([str(py), "-m", "py_compile", "service/app.py"], cwd=str(release_path))
-    details["py_compile"] = (out1 or "")[-1200:]
-    if rc1 != 0:
+    # 4+5) Compile + import inside per-release venv (one interpreter start)
+    rc, out = run([str(py), "-c", VALIDATE_APP_SCRIPT], cwd=str(release_path))
+    if rc == PY_COMPILE_FAILED_RC:
+        details["py_compile"] = (out or "")[-1200:]
         errors.append("py_compile failed")
         write_validation_report(release_path, False, {"errors": errors, **details})
-        return False, out1
+        return False, out
 
-    # 5) Import inside per-release venv
-    rc2, out2 = run([str(py), "-c", "import service.app"], cwd=str(release_path))
-    details["import_test"] = (out2 or "")[-1200:]
-    if rc2 != 0:
+    details["py_compile"] = ""
+    details["import_test"] = (out or "")[-1200:]
+    if rc != 0:
         errors.append("import service.app failed")
         write_validation_report(release_path, False, {"errors": errors, **details})
-        return False, out2
+        return False, out
 
     # ✅ Success
     write_validation_report(release_path, True, {"errors": [], **details})
     return True, "OK"
 
 
+_COPY_NUMBER_RE = re.compile(r"\d+")
+
+def clone_tree(src: Path, dst: Path) -> None:
+    """
+    Copy a release folder. cp --reflink=auto shares blocks on CoW filesystems
+    (XFS, Btrfs) and falls back to a normal copy elsewhere. No hardlinks: the
+    write_text/write_bytes updates truncate files in place and would edit both.
+    """
+    try:
+        rc, _ = run(["cp", "-a", "--reflink=auto", str(src), str(dst)])
+    except OSError:
+        rc = -1
+    if rc != 0:
+        shutil.rmtree(dst, ignore_errors=True)
+        # keep symlinks as links, like cp -a
+        shutil.copytree(src, dst, symlinks=True)
+
 def next_copy_name(base_name: str) -> str:
     prefix = f"{base_name}_copy_"
     max_n = 0
-    if RELEASES.exists():
-        for p in RELEASES.iterdir():
-            if p.is_dir() and p.name.startswith(prefix):
-                m = re.match(rf"^{re.escape(prefix)}(\d+)$", p.name)
-                if m:
-                    max_n = max(max_n, int(m.group(1)))
+    try:
+        with os.scandir(RELEASES) as it:
+            for e in it:
+                # cheap prefix test first; the regex only sees candidates
+                if not e.name.startswith(prefix) or not e.is_dir(follow_symlinks=False):
+                    continue
+                num = e.name[len(prefix):]
+                if _COPY_NUMBER_RE.fullmatch(num):
+                    max_n = max(max_n, int(num))
+    except FileNotFoundError:
+        pass
     return f"{prefix}{max_n+1:03d}"
 
 def _normalize_pkg_name(req: str) -> str:
@@ -830,13 +1726,7 @@ def _normalize_pkg_name(req: str) -> str:
     return s.strip().lower()
 
 def get_release_pip_requirements(release_path: Path) -> list[str]:
-    rj_path = release_path / "release.json"
-    if not rj_path.exists():
-        return []
-    try:
-        rj = json.loads(rj_path.read_text(encoding="utf-8"))
-    except Exception:
-        return []
+    rj = read_json_file(release_path / "release.json")
     deps = rj.get("dependencies", {})
     pip_reqs = deps.get("pip", [])
     if isinstance(pip_reqs, list):
@@ -865,18 +1755,71 @@ def check_missing_dependencies(pip_requirements: list[str]) -> list[str]:
             missing.append(pkg)
 
     # unique but stable order
-    seen = set()
-    ordered = []
-    for x in missing:
-        if x not in seen:
-            seen.add(x)
-            ordered.append(x)
-    return ordered
+    return list(dict.fromkeys(missing))
 
 def release_venv_python(release_path: Path) -> Path:
     return release_path / ".venv" / "bin" / "python"
 
 
+_venv_template_lock = threading.Lock()
+# set after a failed build: release venvs then go straight to python3 -m venv
+# for the rest of the process instead of retrying (and paying) the build each time
+_venv_template_failed = False
+
+def ensure_venv_template() -> bool:
+    """
+    Create the golden venv (with upgraded pip tooling) once; release venvs are
+    cloned from it. Built in a temp dir and renamed so a half-made template is
+    never used.
+    """
+    global _venv_template_failed
+    with _venv_template_lock:
+        if (VENV_TEMPLATE / "bin" / "python").exists():
+            return True
+        if _venv_template_failed:
+            return False
+        tmp = VENV_TEMPLATE.parent / f".venv_template-{uuid.uuid4().hex}"
+        try:
+            rc, _ = run(["python3", "-m", "venv", str(tmp)])
+            if rc == 0:
+                rc, _ = run([str(tmp / "bin" / "python"), "-m", "pip", "install", "--upgrade", "pip", "setuptools", "wheel"])
+            if rc != 0:
+                _venv_template_failed = True
+                return False
+            tmp.rename(VENV_TEMPLATE)
+            relocate_venv_scripts(VENV_TEMPLATE, tmp)
+            return True
+        except OSError:
+            _venv_template_failed = True
+            return False
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+def relocate_venv_scripts(venv: Path, old_path: Path) -> None:
+    """
+    Point the bin/ scripts (activate, pip shebangs) of a moved venv at its new path.
+    """
+    old, new = str(old_path).encode(), str(venv).encode()
+    with os.scandir(venv / "bin") as it:
+        for e in it:
+            if not e.is_file(follow_symlinks=False):
+                continue
+            data = Path(e.path).read_bytes()
+            if old in data:
+                Path(e.path).write_bytes(data.replace(old, new))
+
+def clone_venv_template(dest: Path) -> bool:
+    """
+    Clone VENV_TEMPLATE to dest (reflinked where the filesystem supports it).
+    """
+    try:
+        clone_tree(VENV_TEMPLATE, dest)
+        relocate_venv_scripts(dest, VENV_TEMPLATE)
+        return True
+    except OSError:
+        shutil.rmtree(dest, ignore_errors=True)
+        return False
+
 def ensure_release_venv(release_path: Path) -> tuple[bool, str]:
     """
     Ensure a per-release venv exists at <release_path>/.venv
@@ -888,6 +1831,14 @@ def ensure_release_venv(release_path: Path) -> tuple[bool, str]:
     if py.exists():
         return True, "venv exists"
 
+    # new venv at this path: forget what the old one had installed
+    _installed_cache.pop(str(py), None)
+    _missing_cache.pop(str(py), None)
+
+    # clone the golden venv; build from scratch only if that isn't possible
+    if ensure_venv_template() and clone_venv_template(release_path / ".venv"):
+        return True, "venv cloned from template"
+
     # create venv
     rc, out = run(["python3", "-m", "venv", str(release_path / ".venv")])
     if rc != 0:
@@ -900,18 +1851,186 @@ def ensure_release_venv(release_path: Path) -> tuple[bool, str]:
 
     return True, out2
 
-def pip_install_in_release_venv(release_path: Path, pip_requirements: list[str]) -> tuple[bool, str]:
+def pip_install_cmd(release_path: Path, *args: str, offline: bool = False) -> list[str]:
     """
-    Install pip requirements inside the per-release venv.
+    pip install into the release venv with the shared cache and wheelhouse, plus
+    the release's own wheelhouse/ when it ships one (prestaged wheels).
+    offline=True only looks at the wheelhouses (no index round trips).
     """
-    if not pip_requirements:
-        return True, "no dependencies"
-
     py = release_venv_python(release_path)
-    cmd = [str(py), "-m", "pip", "install"] + pip_requirements
-    rc, out = run(cmd)
-    return (rc == 0), out
+    cmd = [str(py), "-m", "pip", "install", "--cache-dir", str(PIP_CACHE_DIR),
+           "--find-links", str(WHEELHOUSE), "--prefer-binary"]
+    if (release_path / "wheelhouse").is_dir():
+        cmd += ["--find-links", str(release_path / "wheelhouse")]
+    if offline:
+        cmd.append("--no-index")
+    return cmd + list(args)
+
+def req_is_pinned(req: str) -> bool:
+    # exactly one "==<version>" (no wildcard), no URL
+    try:
+        r = Requirement(req)
+    except Exception:
+        return False
+    specs = list(r.specifier)
+    return (r.url is None and len(specs) == 1 and specs[0].operator in ("==", "===")
+            and "*" not in specs[0].version)
+
+def offline_first(release_path: Path, reqs: list[str]) -> bool:
+    """
+    Try the --no-index install first only when it can't freeze versions: the
+    release ships its own wheelhouse/, or every requirement is pinned with ==.
+    Anything looser goes to the index so it gets the current release, not
+    whatever version the shared wheelhouse saw first.
+    """
+    if (release_path / "wheelhouse").is_dir():
+        return True
+    return all(req_is_pinned(r) for r in reqs)
+
+# one wheelhouse update at a time (pip wheel writes straight into WHEELHOUSE)
+_wheelhouse_lock = threading.Lock()
+
+def wheelhouse_pins() -> set[tuple[str, Version]]:
+    # (canonical name, version) of every wheel already in WHEELHOUSE
+    pins = set()
+    try:
+        with os.scandir(WHEELHOUSE) as it:
+            for e in it:
+                try:
+                    name, version, _, _ = parse_wheel_filename(e.name)
+                except InvalidWheelFilename:
+                    continue
+                pins.add((name, version))
+    except FileNotFoundError:
+        pass
+    return pins
+
+def pin_in_wheelhouse(pin: str, have: set[tuple[str, Version]]) -> bool:
+    name, _, version = pin.partition("==")
+    try:
+        return (canonicalize_name(name), Version(version)) in have
+    except InvalidVersion:
+        return False
+
+def populate_wheelhouse(release_path: Path, offline: bool = False) -> None:
+    """
+    Save wheels for the release venv's pins that WHEELHOUSE doesn't have yet,
+    so later releases pinning the same versions install offline.
+    offline: the install was served without the index, so don't query it now.
+    Best effort: failures only cost the next install a download.
+    """
+    with _wheelhouse_lock:
+        py = release_venv_python(release_path)
+        rc, out = run([str(py), "-m", "pip", "freeze", "--exclude-editable"])
+        if rc != 0:
+            return
+        have = wheelhouse_pins()
+        pins = [
+            ln for ln in out.splitlines()
+            if "==" in ln and " @ " not in ln and not pin_in_wheelhouse(ln, have)
+        ]
+        if not pins:
+            return
+        WHEELHOUSE.mkdir(parents=True, exist_ok=True)
+        cmd = [str(py), "-m", "pip", "wheel", "--no-deps", "--quiet", "--cache-dir", str(PIP_CACHE_DIR),
+               "--find-links", str(WHEELHOUSE), "-w", str(WHEELHOUSE)]
+        if (release_path / "wheelhouse").is_dir():
+            cmd += ["--find-links", str(release_path / "wheelhouse")]
+        if offline:
+            cmd.append("--no-index")
+        run(cmd + pins)
+        prune_wheelhouse()
+
+def prune_wheelhouse() -> None:
+    # keep WHEELHOUSE under WHEELHOUSE_MAX_BYTES, dropping the oldest wheels first
+    try:
+        with os.scandir(WHEELHOUSE) as it:
+            files = [(e.stat().st_mtime_ns, e.stat().st_size, e.path) for e in it if e.is_file()]
+    except FileNotFoundError:
+        return
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= WHEELHOUSE_MAX_BYTES:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        total -= size
 
+def populate_wheelhouse_later(release_path: Path, offline: bool) -> None:
+    # off the install/progress path: the release is usable before this finishes
+    threading.Thread(target=populate_wheelhouse, args=(release_path, offline), daemon=True).start()
+
+
+def prefetch_wheels(release_path: Path, missing: list[str], dest: Path) -> bool:
+    """
+    Resolve the full set to install once (pip --dry-run --report), then download
+    every pinned distribution with --no-deps in parallel into dest.
+    Returns True only if every download succeeded.
+    """
+    py = release_venv_python(release_path)
+    report = dest / "report.json"
+    rc, _ = run(pip_install_cmd(release_path, "--dry-run", "--quiet", "--report", str(report), *missing), cwd=release_path)
+    if rc != 0:
+        return False
+    try:
+        items = json_loads(report.read_bytes()).get("install", [])
+        pins = [
+            it["download_info"]["url"] if it.get("is_direct")
+            else f"{it['metadata']['name']}=={it['metadata']['version']}"
+            for it in items
+        ]
+    except (OSError, KeyError, TypeError, ValueError):
+        return False
+    if not pins:
+        return True
+
+    total = len(pins)
+    done = 0
+    lock = threading.Lock()
+    ok_all = True
+    workers = min(PIP_PARALLEL_DOWNLOADS, os.cpu_count() or 1, total, 8)
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        futures = {
+            ex.submit(run, [str(py), "-m", "pip", "download", "--no-deps", "--quiet", "--cache-dir", str(PIP_CACHE_DIR),
+                            "--find-links", str(WHEELHOUSE), "--prefer-binary", "-d", str(dest), pin], release_path): pin
+            for pin in pins
+        }
+        for fut in as_completed(futures):
+            rc, _ = fut.result()
+            ok_all = ok_all and rc == 0
+            with lock:
+                done += 1
+                write_deps_progress(
+                    release_path,
+                    {"status": "running", "progress": int(done / total * 50),
+                     "message": f"Downloading {futures[fut]} ({done}/{total})..."}
+                )
+    return ok_all
+
+# "Collecting fastapi>=0.110 (from ...)" -> "fastapi>=0.110"
+_PIP_COLLECTING_RE = re.compile(r"^Collecting (\S+)")
+# "  Downloading numpy-2.4.6-cp311-...whl (16.9 MB)" and, with --progress-bar raw,
+# "Progress 8388608 of 16918164" (bytes) while it downloads
+_PIP_DOWNLOADING_RE = re.compile(r"^\s*Downloading (\S+)")
+_PIP_PROGRESS_RE = re.compile(r"^Progress (\d+) of (\d+)")
+
+def pip_progress_bar(release_path: Path) -> str:
+    """
+    "raw" (machine-readable byte counts, pip >= 24.1) if the release venv's pip
+    supports it, else "off". Read from pip's dist-info name, no subprocess.
+    """
+    sp = release_site_packages(release_path)
+    if sp is not None:
+        for info in sp.glob("pip-*.dist-info"):
+            version = info.name[len("pip-"):-len(".dist-info")].split(".")
+            try:
+                if tuple(int(x) for x in version[:2]) >= (24, 1):
+                    return "raw"
+            except ValueError:
+                pass
+    return "off"
 
 def install_missing_deps_with_progress(release_path: Path) -> tuple[bool, str]:
     # ✅ Ensure per-release venv exists first
@@ -929,12 +2048,89 @@ def install_missing_deps_with_progress(release_path: Path) -> tuple[bool, str]:
 
     total = len(missing)
     ok_all = True
-    combined_out = ""
 
     write_deps_progress(release_path, {"status": "running", "progress": 0, "message": f"Installing {total} packages..."})
 
-    py = release_venv_python(release_path)
+    # one pip run for everything; progress follows pip's own output
+    wanted = {req_to_pkg(r) for r in missing}
+    collected = set()
+    base_pct = 0
+    downloading = ""
+
+    def collected_pct() -> int:
+        return base_pct + int(len(collected) / total * (80 - base_pct))
+
+    def on_line(line: str) -> None:
+        nonlocal downloading
+        if m := _PIP_PROGRESS_RE.match(line):
+            done, size = int(m.group(1)), int(m.group(2))
+            if downloading and size:
+                write_deps_progress(
+                    release_path,
+                    {"status": "running", "progress": collected_pct(),
+                     "message": f"Downloading {downloading}: {done / 1e6:.1f} of {size / 1e6:.1f} MB"}
+                )
+            return
+        if m := _PIP_DOWNLOADING_RE.match(line):
+            downloading = m.group(1)
+            return
+        m = _PIP_COLLECTING_RE.match(line)
+        name = req_to_pkg(m.group(1)) if m else ""
+        if name in wanted:
+            collected.add(name)
+            write_deps_progress(
+                release_path,
+                {"status": "running", "progress": collected_pct(),
+                 "message": f"Collecting {name} ({len(collected)}/{total})..."}
+            )
+        elif line.startswith("Installing collected packages:"):
+            write_deps_progress(release_path, {"status": "running", "progress": 90, "message": "Installing collected packages..."})
+
+    # 1) offline from the wheelhouses, when that can't pin loose requirements
+    #    to an old version (see offline_first)
+    offline = offline_first(release_path, missing)
+    rc, out = 1, ""
+    if offline:
+        rc, out = run_streaming(pip_install_cmd(release_path, "--progress-bar", "off", *missing, offline=True), on_line, cwd=release_path)
+
+    # 2) optional parallel download, then offline from those wheels
+    if rc != 0 and PIP_PARALLEL_DOWNLOADS > 0:
+        UPLOADS.mkdir(parents=True, exist_ok=True)
+        wheel_dir = Path(tempfile.mkdtemp(prefix="wheels-", dir=UPLOADS))
+        try:
+            if prefetch_wheels(release_path, missing, wheel_dir):
+                base_pct = 50
+                rc, out = run_streaming(
+                    pip_install_cmd(release_path, "--progress-bar", "off", "--find-links", str(wheel_dir), *missing, offline=True),
+                    on_line,
+                    cwd=release_path,
+                )
+                if rc == 0:
+                    # keep the downloaded wheels: the wheelhouse step then has nothing to fetch
+                    WHEELHOUSE.mkdir(parents=True, exist_ok=True)
+                    for whl in wheel_dir.glob("*.whl"):
+                        if not (WHEELHOUSE / whl.name).exists():
+                            shutil.move(str(whl), str(WHEELHOUSE / whl.name))
+        finally:
+            shutil.rmtree(wheel_dir, ignore_errors=True)
+
+    # 3) against the index, with byte-level download progress
+    if rc != 0:
+        offline = False
+        rc, out = run_streaming(
+            pip_install_cmd(release_path, "--progress-bar", pip_progress_bar(release_path), *missing),
+            on_line,
+            cwd=release_path,
+        )
+        out = "".join(ln for ln in out.splitlines(keepends=True) if not _PIP_PROGRESS_RE.match(ln))
+    combined_out = f"\n--- {' '.join(missing)} ---\n{out}\n"
 
+    if rc == 0:
+        write_deps_progress(release_path, {"status": "done", "progress": 100, "message": "Dependencies installed"})
+        populate_wheelhouse_later(release_path, offline)
+        return True, combined_out
+
+    # batch failed: go one by one to find the culprit
     for i, req in enumerate(missing, start=1):
         pct = int((i / total) * 100)
         write_deps_progress(
@@ -942,7 +2138,7 @@ def install_missing_deps_with_progress(release_path: Path) -> tuple[bool, str]:
             {"status": "running", "progress": pct, "message": f"Installing {req} ({i}/{total})..."}
         )
 
-        rc, out = run([str(py), "-m", "pip", "install", req], cwd=str(release_path))
+        rc, out = run(pip_install_cmd(release_path, req), cwd=str(release_path))
         combined_out += f"\n--- {req} ---\n{out}\n"
 
         if rc != 0:
@@ -955,6 +2151,7 @@ def install_missing_deps_with_progress(release_path: Path) -> tuple[bool, str]:
 
     if ok_all:
         write_deps_progress(release_path, {"status": "done", "progress": 100, "message": "Dependencies installed"})
+        populate_wheelhouse_later(release_path, offline=False)
         return True, combined_out
 
     return False, combined_out
@@ -965,7 +2162,7 @@ def deps_progress_path(release_path: Path) -> Path:
 
 
 def write_deps_progress(release_path: Path, data: dict) -> None:
-    deps_progress_path(release_path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+    deps_progress_path(release_path).write_bytes(json_dumps_pretty(data))
 
 
 def read_deps_progress(release_path: Path) -> dict:
@@ -973,17 +2170,14 @@ def read_deps_progress(release_path: Path) -> dict:
     if not p.exists():
         return {"status": "idle", "progress": 0, "message": ""}
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        return json_loads(p.read_bytes())
     except Exception:
         return {"status": "idle", "progress": 0, "message": ""}
 
 
 def get_release_service_type(release_path: Path) -> str:
-    rj = release_path / "release.json"
-    if not rj.exists():
-        return "fastapi"
+    data = read_json_file(release_path / "release.json")
     try:
-        data = json.loads(rj.read_text(encoding="utf-8"))
         return (data.get("service_type") or "fastapi").lower()
     except Exception:
         return "fastapi"
@@ -1001,10 +2195,12 @@ def get_release_python(release_path: Path) -> Path:
 from packaging.utils import canonicalize_name
 from packaging.requirements import Requirement
 
+@lru_cache(maxsize=4096)
 def req_to_pkg(req: str) -> str:
     """
     Extract canonical package name from a requirement string.
     Handles versions and extras: uvicorn[standard]>=0.25 -> uvicorn
+    Memoized: releases list mostly the same requirement strings.
     """
     try:
         r = Requirement(req)